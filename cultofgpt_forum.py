@@ -1,9 +1,47 @@
+import asyncio
+import io
 import time
-from typing import List, Dict, Optional
+from typing import BinaryIO, Dict, Iterable, List, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse, parse_qs
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+try:  # optional, only needed for the async pollers
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+
+def _soup(text: str) -> BeautifulSoup:
+    return BeautifulSoup(text, "lxml")
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_USERNAME = etree.XPath(f".//*[{_has_class('username')}]")
+_STRONG = etree.XPath(".//strong")
+_BY_ID = etree.XPath(".//*[@id=$id]")
+_POST_BODY = etree.XPath(f".//*[{_has_class('post_body')}]")
+_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+
+
+# start of MyBB's invalid_post_code message, shown when my_post_key is stale
+_INVALID_POST_CODE = "Authorization code mismatch"
+# a rejected post is sent once more with fresh keys
+_FORM_ATTEMPTS = 2
+
+
+def _strings(elem) -> List[str]:
+    return [s.strip() for s in _TEXT(elem) if s.strip()]
 
 
 class CultOfGPTForum:
@@ -12,14 +50,39 @@ class CultOfGPTForum:
     def __init__(self, base_url: str = "https://cultofgpt.org/forum"):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        # Keep connections to the forum alive between polls and posts so
+        # repeated requests don't pay for a new TCP/TLS handshake each time.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                # gzip/deflate plus br/zstd when urllib3 can decode them
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+                "User-Agent": "cultofgpt-client/1.0",
+            }
+        )
+        # form url -> ({posthash, my_post_key}, fetched_at)
+        self._key_cache: Dict[str, Tuple[Dict[str, str], float]] = {}
+        # thread page url -> conditional request headers / last parsed posts
+        self._cond: Dict[str, Dict[str, str]] = {}
+        self._posts: Dict[str, List[Dict[str, str]]] = {}
+        # For pages served without an ETag, probe with HEAD and skip the GET when
+        # Content-Length and Last-Modified are unchanged. Disable for servers
+        # where Content-Length does not track the page content.
+        self.enable_head_probe = True
+        self._last_meta: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
 
     def login(self, username: str, password: str) -> bool:
         """Login to the forum and return True on success."""
         resp = self.session.get(f"{self.base_url}/member.php?action=login")
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        key = soup.find("input", {"name": "my_post_key"})
-        my_post_key = key["value"] if key else ""
+        my_post_key = self._parse_form(resp.text)["my_post_key"]
         data = {
             "action": "do_login",
             "url": "",
@@ -30,112 +93,457 @@ class CultOfGPTForum:
         }
         r = self.session.post(f"{self.base_url}/member.php", data=data)
         r.raise_for_status()
+        # Post keys are tied to the session, so any cached ones are stale now
+        self._key_cache.clear()
         # Successful login sets the 'mybbuser' cookie
         return "mybbuser" in self.session.cookies
 
-    def _parse_key(self, text: str) -> str:
-        soup = BeautifulSoup(text, "html.parser")
-        key = soup.find("input", {"name": "my_post_key"})
-        return key["value"] if key else ""
+    def _parse_form(self, text: str) -> Dict[str, str]:
+        """Return the posthash and my_post_key hidden inputs of a page ("" if missing)."""
+        form = {"posthash": "", "my_post_key": ""}
+        for tag in _soup(text).select("input[name=my_post_key], input[name=posthash]"):
+            form[tag["name"]] = tag.get("value", "")
+        return form
+
+    def _cached_form(self, url: str, ttl: float = 300) -> Optional[Dict[str, str]]:
+        """Return the cached hidden posting fields for url, or None if missing or older than ttl."""
+        cached = self._key_cache.get(url)
+        if cached and time.time() - cached[1] < ttl:
+            return cached[0]
+        return None
+
+    def _store_form(self, url: str, text: str) -> Dict[str, str]:
+        form = self._parse_form(text)
+        self._key_cache[url] = (form, time.time())
+        return form
+
+    def _get_post_form(self, url: str) -> Dict[str, str]:
+        """Return the hidden posting fields for the form at url, fetching them if not cached."""
+        form = self._cached_form(url)
+        if form is None:
+            page = self.session.get(url)
+            page.raise_for_status()
+            form = self._store_form(url, page.text)
+        return form
+
+    def _retry_form(
+        self, url: str, form: Dict[str, str], status: int, resp_url: str, location: str, text: str, redirected: bool
+    ) -> bool:
+        """Whether a POST of form to url should be sent again, evicting its stale keys if so.
+
+        The cache entry is only evicted while it still holds form, so a reply
+        rejected after another one already refreshed the keys reuses them.
+        """
+        if not self._form_rejected(status, resp_url, location, text, redirected):
+            return False
+        if self._key_cache.get(url, (None,))[0] is form:
+            del self._key_cache[url]
+        return True
+
+    @staticmethod
+    def _form_rejected(status: int, url: str, location: str, text: str, redirected: bool) -> bool:
+        """Whether a posting form was refused because of a stale post key or session.
+
+        Other form errors (flood control, message too short, ...) are not
+        retried since posting again cannot fix them.
+        """
+        return (
+            400 <= status < 500
+            or "action=login" in url
+            or "action=login" in location
+            # MyBB's invalid_post_code error; a redirected response already
+            # landed on the thread, whose posts may contain any text
+            or (not redirected and _INVALID_POST_CODE in text)
+        )
+
+    def _refresh_param(self, text: str, name: str) -> str:
+        """Return a query parameter of a page's meta refresh target ("" if absent)."""
+        meta = _soup(text).find("meta", {"http-equiv": "refresh"})
+        if meta and "url=" in meta.get("content", "").lower():
+            redirect = meta["content"].split("url=")[-1]
+            return parse_qs(urlparse(redirect).query).get(name, [""])[0]
+        return ""
+
+    def _submit_form(self, url: str, data: Dict[str, object], **kwargs) -> requests.Response:
+        """POST data to a posting form, retrying once with fresh keys if they were rejected."""
+        for _ in range(_FORM_ATTEMPTS):
+            form = self._get_post_form(url)
+            data.update(form)
+            resp = self.session.post(url, data=data, **kwargs)
+            if not self._retry_form(
+                url, form, resp.status_code, resp.url, resp.headers.get("Location", ""), resp.text, bool(resp.history)
+            ):
+                break
+        return resp
 
     def create_thread(self, forum_id: int, subject: str, message: str) -> str:
         """Create a thread and return the thread id."""
         url = f"{self.base_url}/newthread.php?fid={forum_id}"
-        page = self.session.get(url)
-        page.raise_for_status()
-        posthash = BeautifulSoup(page.text, "html.parser").find(
-            "input", {"name": "posthash"}
-        )
-        posthash_val = posthash["value"] if posthash else ""
         data = {
             "action": "do_newthread",
             "subject": subject,
             "message": message,
             "fid": forum_id,
-            "posthash": posthash_val,
-            "my_post_key": self._parse_key(page.text),
             "submit": "Post Thread",
         }
-        resp = self.session.post(url, data=data, allow_redirects=False)
+        resp = self._submit_form(url, data, allow_redirects=False)
         if resp.status_code in (301, 302) and "Location" in resp.headers:
             loc = resp.headers["Location"]
             tid = parse_qs(urlparse(loc).query).get("tid", [None])[0]
             return tid or ""
         resp.raise_for_status()
         # Some installations use a meta refresh to redirect to the new thread
-        soup = BeautifulSoup(resp.text, "html.parser")
-        meta = soup.find("meta", {"http-equiv": "refresh"})
-        if meta and "url=" in meta.get("content", "").lower():
-            redirect = meta["content"].split("url=")[-1]
-            tid = parse_qs(urlparse(redirect).query).get("tid", [""])[0]
-            if tid:
-                return tid
+        tid = self._refresh_param(resp.text, "tid")
+        if tid:
+            return tid
         return parse_qs(urlparse(resp.url).query).get("tid", [""])[0]
 
     def reply_thread(self, thread_id: str, message: str, replyto: str | None = None) -> str:
         """Reply to a thread. Returns the new post id."""
         url = f"{self.base_url}/newreply.php?tid={thread_id}"
-        page = self.session.get(url)
-        page.raise_for_status()
-        soup = BeautifulSoup(page.text, "html.parser")
-        posthash = soup.find("input", {"name": "posthash"})
-        posthash_val = posthash["value"] if posthash else ""
+        resp = self._submit_form(url, self._reply_data(thread_id, message, replyto))
+        resp.raise_for_status()
+        return self._refresh_param(resp.text, "pid")
+
+    @staticmethod
+    def _reply_data(thread_id: str, message: str, replyto: Optional[str]) -> Dict[str, str]:
         data = {
             "action": "do_newreply",
             "tid": thread_id,
             "subject": "",
             "message": message,
-            "posthash": posthash_val,
-            "my_post_key": self._parse_key(page.text),
             "submit": "Post Reply",
         }
         if replyto:
             data["replyto"] = replyto
-        resp = self.session.post(url, data=data)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        meta = soup.find("meta", {"http-equiv": "refresh"})
-        if meta and "url=" in meta.get("content", "").lower():
-            redirect = meta["content"].split("url=")[-1]
-            pid = parse_qs(urlparse(redirect).query).get("pid", [""])[0]
-            return pid
-        return ""
+        return data
 
-    def fetch_posts(self, thread_id: str) -> List[Dict[str, str]]:
-        """Return a list of posts from the given thread."""
-        r = self.session.get(f"{self.base_url}/showthread.php?tid={thread_id}")
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+    def _parse_posts(self, source: BinaryIO, encoding: Optional[str] = None) -> List[Dict[str, str]]:
+        """Extract posts from a thread page read incrementally from source.
+
+        Each post element is discarded as soon as it has been read, so the
+        whole document is never held in memory at once.
+        """
         posts = []
-        for div in soup.find_all("div", id=lambda x: x and x.startswith("post_") and x[5:].isdigit()):
-            pid = div.get("id", "").split("_")[-1]
-            author_tag = div.find(class_="username") or div.find("strong")
-            author = author_tag.get_text(strip=True) if author_tag else "Unknown"
-            body_tag = div.find(id=f"pid_{pid}") or div.find(class_="post_body")
-            body = body_tag.get_text("\n", strip=True) if body_tag else ""
-            posts.append({"id": pid, "author": author, "content": body})
+        events = etree.iterparse(source, events=("end",), tag="div", html=True, encoding=encoding)
+        try:
+            for _, div in events:
+                div_id = div.get("id", "")
+                pid = div_id[5:]
+                if not (div_id.startswith("post_") and pid.isdigit()):
+                    continue
+                authors = _USERNAME(div) or _STRONG(div)
+                author = "".join(_strings(authors[0])) if authors else "Unknown"
+                bodies = _BY_ID(div, id=f"pid_{pid}") or _POST_BODY(div)
+                body = "\n".join(_strings(bodies[0])) if bodies else ""
+                posts.append({"id": pid, "author": author, "content": body})
+                div.clear()
+                while div.getprevious() is not None:
+                    del div.getparent()[0]
+        except etree.XMLSyntaxError:
+            if posts:
+                raise
+            # empty document
+        return posts
+
+    def _thread_posts(self, url: str) -> List[Dict[str, str]]:
+        """Fetch and parse a thread page, reusing the last result if it is unchanged."""
+        # The probe can only short-circuit when the last GET had a
+        # Content-Length, and is redundant when an ETag can be revalidated.
+        if (
+            self.enable_head_probe
+            and url in self._posts
+            and self._last_meta.get(url, (None, None))[0]
+            and "If-None-Match" not in self._cond.get(url, {})
+        ):
+            h = self.session.head(url)
+            meta = (h.headers.get("Content-Length"), h.headers.get("Last-Modified"))
+            if h.ok and meta[0] and self._last_meta.get(url) == meta:
+                return self._posts[url]
+        headers = self._cond.get(url, {}) if url in self._posts else {}
+        with self.session.get(url, headers=headers, stream=True) as r:
+            if r.status_code == 304 or not r.ok:
+                # drain the (empty or short) body so closing the response
+                # returns the connection to the pool instead of dropping it
+                r.content
+            if r.status_code == 304:
+                return self._posts[url]
+            r.raise_for_status()
+            r.raw.decode_content = True
+            # requests falls back to ISO-8859-1 without a charset; let lxml sniff instead
+            encoding = r.encoding if "charset" in r.headers.get("Content-Type", "") else None
+            # reading r.raw directly bypasses requests' exception translation
+            try:
+                posts = self._parse_posts(r.raw, encoding)
+            except ProtocolError as e:
+                raise requests.exceptions.ChunkedEncodingError(e) from e
+            except DecodeError as e:
+                raise requests.exceptions.ContentDecodingError(e) from e
+            except ReadTimeoutError as e:
+                raise requests.exceptions.ConnectionError(e) from e
+            # only record the validators once the body has been fully parsed
+            cond = {
+                "If-None-Match": r.headers.get("ETag", ""),
+                "If-Modified-Since": r.headers.get("Last-Modified", ""),
+            }
+            self._cond[url] = {k: v for k, v in cond.items() if v}
+            self._last_meta[url] = (r.headers.get("Content-Length"), r.headers.get("Last-Modified"))
+        self._posts[url] = posts
         return posts
 
+    def fetch_posts(self, thread_id: str) -> List[Dict[str, str]]:
+        """Return a list of posts from the given thread."""
+        return list(self._thread_posts(f"{self.base_url}/showthread.php?tid={thread_id}"))
+
+    def fetch_posts_since(self, thread_id: str, since_pid: int = 0) -> List[Dict[str, str]]:
+        """Return posts newer than since_pid from the last page of the thread.
+
+        Only the last page is fetched, so if more than a page worth of posts
+        arrived since since_pid the older ones are not included.
+        """
+        posts = self._thread_posts(f"{self.base_url}/showthread.php?tid={thread_id}&page=last")
+        return [p for p in posts if int(p["id"]) > since_pid]
+
     def poll_thread(
-        self, thread_id: str, interval: int = 30, timeout: int = 300
+        self, thread_id: str, interval: int = 30, timeout: int = 300, since_pid: int = 0
     ) -> List[Dict[str, str]]:
-        """Poll the thread for new posts until timeout seconds have passed."""
+        """Poll the thread for posts newer than since_pid until timeout seconds have passed.
+
+        Pass the highest post id already seen as since_pid to only wait for
+        replies made after it.
+        """
         start = time.time()
-        seen = set()
         while time.time() - start < timeout:
-            posts = self.fetch_posts(thread_id)
-            new_posts = [p for p in posts if p["id"] not in seen]
+            new_posts = self.fetch_posts_since(thread_id, since_pid)
             if new_posts:
-                seen.update(p["id"] for p in new_posts)
                 return new_posts
             time.sleep(interval)
         return []
 
-    def poll_once(self, thread_id: str, seen: Optional[List[str]] = None) -> List[Dict[str, str]]:
-        """Fetch posts from a thread and return ones not in the optional seen list."""
+    def poll_once(
+        self, thread_id: str, seen: Optional[Union[Set[str], List[str]]] = None
+    ) -> List[Dict[str, str]]:
+        """Fetch posts from a thread and return ones not in the optional seen set.
+
+        seen is updated in place with the ids of the returned posts. A list is
+        still accepted for backwards compatibility but costs a set rebuild per call.
+        """
         posts = self.fetch_posts(thread_id)
         if seen is None:
             return posts
-        new_posts = [p for p in posts if p["id"] not in set(seen)]
+        if isinstance(seen, set):
+            new_posts = [p for p in posts if p["id"] not in seen]
+            seen.update(p["id"] for p in new_posts)
+            return new_posts
+        known = set(seen)
+        new_posts = [p for p in posts if p["id"] not in known]
         seen.extend(p["id"] for p in new_posts)
         return new_posts
+
+    def _client_session(self) -> "aiohttp.ClientSession":
+        """Build an aiohttp session sharing this client's cookies and headers."""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the async API")
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            cookie_jar=aiohttp.CookieJar(),
+            headers={"User-Agent": self.session.headers["User-Agent"]},
+        )
+        session.cookie_jar.update_cookies(
+            {c.name: c.value for c in self.session.cookies}, response_url=URL(self.base_url)
+        )
+        return session
+
+    async def _fetch_posts_since_async(
+        self, session: "aiohttp.ClientSession", thread_id: str, since_pid: int
+    ) -> List[Dict[str, str]]:
+        """Async counterpart of :meth:`fetch_posts_since`."""
+        url = f"{self.base_url}/showthread.php?tid={thread_id}&page=last"
+        async with session.get(url) as r:
+            r.raise_for_status()
+            content = await r.read()
+            posts = self._parse_posts(io.BytesIO(content), r.charset)
+        return [p for p in posts if int(p["id"]) > since_pid]
+
+    async def poll_threads_async(
+        self,
+        thread_ids: Iterable[str],
+        interval: int = 30,
+        timeout: int = 300,
+        since_pids: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """Poll several threads concurrently until one of them gets posts newer than its since pid.
+
+        since_pids maps thread ids to the highest post id already seen, as
+        since_pid does for :meth:`poll_thread`. Threads missing from it start
+        from the posts present at the first request. Only the last page of
+        each thread is fetched. Returns a mapping of thread id to its new
+        posts, containing only the threads that changed, or an empty dict
+        once timeout seconds have passed.
+        """
+        thread_ids = list(thread_ids)
+        since = dict(since_pids or {})
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # One session for the whole poll keeps the connections warm.
+        async with self._client_session() as session:
+
+            async def fetch_all() -> List[List[Dict[str, str]]]:
+                return await asyncio.gather(
+                    *[self._fetch_posts_since_async(session, tid, since.get(tid, 0)) for tid in thread_ids]
+                )
+
+            first = True
+            while loop.time() - start < timeout:
+                if not first:
+                    await asyncio.sleep(interval)
+                changed = {}
+                for tid, posts in zip(thread_ids, await fetch_all()):
+                    if first and tid not in since:
+                        since[tid] = max((int(p["id"]) for p in posts), default=0)
+                    elif posts:
+                        changed[tid] = posts
+                first = False
+                if changed:
+                    return changed
+        return {}
+
+    async def poll_thread_async(
+        self, thread_id: str, interval: int = 30, timeout: int = 300, since_pid: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        """Async counterpart of :meth:`poll_thread`.
+
+        Unlike poll_thread, leaving since_pid unset waits for posts made after
+        the first request instead of returning the existing ones.
+        """
+        since_pids = None if since_pid is None else {thread_id: since_pid}
+        changed = await self.poll_threads_async([thread_id], interval, timeout, since_pids)
+        return changed.get(thread_id, [])
+
+
+class ReplyBatcher:
+    """Post replies for a :class:`CultOfGPTForum` concurrently.
+
+    Replies queued with :meth:`reply_thread_async` are collected into batches
+    of up to max_batch_size, waiting at most max_queue_time seconds for a batch
+    to fill, and each batch is posted with at most concurrency requests in
+    flight over one keep-alive aiohttp session::
+
+        async with ReplyBatcher(forum) as batcher:
+            futures = [batcher.reply_thread_async(tid, msg) for msg in messages]
+            pids = await asyncio.gather(*futures)
+    """
+
+    def __init__(
+        self,
+        forum: CultOfGPTForum,
+        max_batch_size: int = 16,
+        max_queue_time: float = 0.05,
+        concurrency: int = 4,
+    ):
+        self.forum = forum
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self.concurrency = concurrency
+        self._queue: Optional[asyncio.Queue] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._form_locks: Dict[str, asyncio.Lock] = {}
+
+    def _check_started(self) -> None:
+        if self._queue is None:
+            raise RuntimeError("ReplyBatcher.start() must be awaited first")
+
+    async def start(self) -> None:
+        self._session = self.forum._client_session()
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Wait for queued replies to be posted, then release the session."""
+        self._check_started()
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        await self._session.close()
+
+    async def __aenter__(self) -> "ReplyBatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def reply_thread_async(
+        self, thread_id: str, message: str, replyto: Optional[str] = None
+    ) -> "asyncio.Future[str]":
+        """Queue a reply; the returned future resolves to the new post id."""
+        self._check_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((thread_id, message, replyto, future))
+        return future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_queue_time
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self.process_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def process_batch(self, items: List[tuple]) -> None:
+        await asyncio.gather(*[self._post(*item) for item in items])
+
+    async def _post(self, thread_id: str, message: str, replyto: Optional[str], future: asyncio.Future) -> None:
+        try:
+            async with self._semaphore:
+                pid = await self._reply(thread_id, message, replyto)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(pid)
+
+    async def _get_post_form(self, url: str) -> Dict[str, str]:
+        # shares the forum's cache with the synchronous posting methods
+        form = self.forum._cached_form(url)
+        if form is None:
+            # one fetch per url; concurrent replies wait for it and reuse it
+            async with self._form_locks.setdefault(url, asyncio.Lock()):
+                form = self.forum._cached_form(url)
+                if form is None:
+                    async with self._session.get(url) as page:
+                        page.raise_for_status()
+                        form = self.forum._store_form(url, await page.text())
+        return form
+
+    async def _reply(self, thread_id: str, message: str, replyto: Optional[str]) -> str:
+        url = f"{self.forum.base_url}/newreply.php?tid={thread_id}"
+        data = self.forum._reply_data(thread_id, message, replyto)
+        for _ in range(_FORM_ATTEMPTS):
+            form = await self._get_post_form(url)
+            data.update(form)
+            async with self._session.post(url, data=data) as resp:
+                text = await resp.text()
+                retry = self.forum._retry_form(
+                    url, form, resp.status, str(resp.url), resp.headers.get("Location", ""), text, bool(resp.history)
+                )
+            if not retry:
+                break
+        resp.raise_for_status()
+        return self.forum._refresh_param(text, "pid")
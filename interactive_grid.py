@@ -1,7 +1,7 @@
 import argparse
 import matplotlib.pyplot as plt
 
-from simulator import GridCircuit, Wire, Resistor, VoltageSource, LED, draw_grid
+from simulator import GridCircuit, Wire, Resistor, VoltageSource, LED, draw_grid_incremental
 
 class InteractiveGrid:
     def __init__(self, width=16, height=16):
@@ -9,6 +9,9 @@ class InteractiveGrid:
         self.tool = 'wire'
         self.first = None
         self.fig, self.ax = plt.subplots()
+        # artists kept between refreshes so only changes are redrawn
+        self._artists = {}
+        self._volt_texts = {}
         self.setup_axes()
         self.cid_click = self.fig.canvas.mpl_connect('button_press_event', self.on_click)
         self.cid_key = self.fig.canvas.mpl_connect('key_press_event', self.on_key)
@@ -64,8 +67,7 @@ class InteractiveGrid:
                 elif self.tool == 'led':
                     self.grid.add(LED(a, b))
                 elif self.tool == 'erase':
-                    self.grid.components = [c for c in self.grid.components
-                                            if not ({c.a, c.b} == {a, b})]
+                    self.grid.remove(a, b)
             except Exception as e:
                 print('Error:', e)
             self.first = None
@@ -76,9 +78,7 @@ class InteractiveGrid:
             volt, cur, solver = self.grid.solve()
         except Exception:
             volt, solver = {}, None
-        self.ax.clear()
-        self.setup_axes()
-        draw_grid(self.grid, volt, solver, ax=self.ax)
+        draw_grid_incremental(self.grid, volt, solver, self.ax, self._artists, self._volt_texts)
         self.fig.canvas.draw_idle()
 
 
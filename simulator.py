@@ -1,34 +1,57 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
 from collections import defaultdict
 
+try:  # optional, JIT-compiles the LED fixed point for small circuits
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Largest MNA system solved densely by the JIT path; bigger ones use splu,
+# whose cached factorization wins from roughly this size on.
+JIT_MAX_SIZE = 64
+
 class UnionFind:
     def __init__(self):
         self.parent = {}
+        self.rank = {}
     def find(self, x):
-        if self.parent.setdefault(x, x) != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        root = self.parent.setdefault(x, x)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # second pass: point every node on the path straight at the root
+        while x != root:
+            nxt = self.parent[x]
+            self.parent[x] = root
+            x = nxt
+        return root
     def union(self, a, b):
         pa, pb = self.find(a), self.find(b)
-        if pa != pb:
-            self.parent[pb] = pa
+        if pa == pb:
+            return
+        ra, rb = self.rank.get(pa, 0), self.rank.get(pb, 0)
+        if ra < rb:
+            pa, pb = pb, pa
+        self.parent[pb] = pa
+        if ra == rb:
+            self.rank[pa] = ra + 1
 
 def compute_lumps(nodes, components):
-    uf = UnionFind()
-    for n in nodes:
-        uf.parent.setdefault(n, n)
-    for c in components:
-        if isinstance(c, Wire):
-            uf.union(c.a, c.b)
-    mapping = {}
-    index = {}
-    for n in nodes:
-        root = uf.find(n)
-        if root not in index:
-            index[root] = len(index)
-        mapping[n] = index[root]
-    return mapping, len(index)
+    """Map each node to the index of the wire-connected lump it belongs to."""
+    nodes = list(nodes)
+    ids = {n: i for i, n in enumerate(nodes)}
+    wires = [c for c in components if isinstance(c, Wire)]
+    row = [ids[c.a] for c in wires]
+    col = [ids[c.b] for c in wires]
+    adjacency = sparse.csr_matrix(
+        (np.ones(len(row)), (row, col)), shape=(len(nodes), len(nodes))
+    )
+    n_lumps, labels = connected_components(adjacency, directed=False)
+    mapping = {n: int(labels[ids[n]]) for n in nodes}
+    return mapping, n_lumps
 
 class Component:
     def __init__(self, a, b, name=""):
@@ -50,6 +73,8 @@ class VoltageSource(Component):
         self.voltage = voltage
 
 class LED(Component):
+    r_off = 1e9
+
     def __init__(self, a, b, r_on=50.0, threshold=2.0, name="LED"):
         super().__init__(a, b, name)
         self.r_on = r_on
@@ -57,7 +82,7 @@ class LED(Component):
         self.on = False
 
     def effective_resistance(self):
-        return self.r_on if self.on else 1e9
+        return self.r_on if self.on else self.r_off
 
 class GridCircuit:
     """Circuit stored on a rectangular grid."""
@@ -66,6 +91,24 @@ class GridCircuit:
         self.height = height
         self.components = []
 
+    @property
+    def components(self):
+        """Components in insertion order, as a tuple; use add/remove to change them."""
+        return tuple(self._components)
+
+    @components.setter
+    def components(self, comps):
+        # insertion-ordered dict used as a set, plus an index by endpoint pair
+        self._components = dict.fromkeys(comps)
+        self.reindex()
+        self._solver_cache = None  # (topology key, Solver)
+
+    def reindex(self):
+        """Rebuild the endpoint index after editing component endpoints in place."""
+        self._by_endpoints = defaultdict(list)
+        for comp in self._components:
+            self._by_endpoints[frozenset((comp.a, comp.b))].append(comp)
+
     def _in_bounds(self, pos):
         x, y = pos
         return 0 <= x < self.width and 0 <= y < self.height
@@ -73,11 +116,31 @@ class GridCircuit:
     def add(self, comp):
         if not (self._in_bounds(comp.a) and self._in_bounds(comp.b)):
             raise ValueError("component endpoints outside grid")
-        self.components.append(comp)
+        if comp in self._components:
+            return
+        self._components[comp] = None
+        self._by_endpoints[frozenset((comp.a, comp.b))].append(comp)
+        self._solver_cache = None
+
+    def remove(self, a, b):
+        """Remove every component between cells *a* and *b* and return them.
+
+        Components are found by the endpoints they had when added; call
+        :meth:`reindex` first if endpoints were edited in place.
+        """
+        removed = self._by_endpoints.pop(frozenset((a, b)), [])
+        for comp in removed:
+            del self._components[comp]
+        if removed:
+            self._solver_cache = None
+        return removed
 
     def clear(self):
         self.components = []
 
+    def _topology(self):
+        return tuple((type(c).__name__, c.a, c.b, id(c)) for c in self._components)
+
     def to_circuit(self):
         c = Circuit()
         for comp in self.components:
@@ -85,10 +148,18 @@ class GridCircuit:
         return c
 
     def solve(self, ground=(0, 0)):
-        circuit = self.to_circuit()
-        if ground not in circuit.nodes():
-            return {}, {}, None
-        solver = Solver(circuit, ground=ground)
+        # Reuse the solver (lumps, index arrays, factorization) while the
+        # set of components is unchanged; only their values are reloaded.
+        key = (ground, self._topology())
+        if self._solver_cache is not None and self._solver_cache[0] == key:
+            solver = self._solver_cache[1]
+            solver.refresh()
+        else:
+            circuit = self.to_circuit()
+            if ground not in circuit.nodes():
+                return {}, {}, None
+            solver = Solver(circuit, ground=ground)
+            self._solver_cache = (key, solver)
         voltages, currents = solver.solve()
         cell_volt = {pos: voltages[idx] for pos, idx in solver.node_map.items()}
         return cell_volt, currents, solver
@@ -105,86 +176,223 @@ class Circuit:
             n.add(c.b)
         return n
 
+def _stamp(A, i, j, g):
+    if i >= 0:
+        A[i, i] += g
+    if j >= 0:
+        A[j, j] += g
+    if i >= 0 and j >= 0:
+        A[i, j] -= g
+        A[j, i] -= g
+
+def _solve_ledloop(res_i, res_j, g_res, led_i, led_j, g_on, g_off, thresh, led_on,
+                   vs_i, vs_j, vs_v, N, M, max_iter):
+    """Dense LED fixed point over precomputed index arrays (see Solver._build_topology).
+
+    Returns the final solution vector and LED states.
+    """
+    size = N + M
+    led_on = led_on.copy()
+    x = np.zeros(size)
+    for _ in range(max_iter):
+        A = np.zeros((size, size))
+        z = np.zeros(size)
+        for k in range(len(g_res)):
+            _stamp(A, res_i[k], res_j[k], g_res[k])
+        for k in range(len(led_on)):
+            _stamp(A, led_i[k], led_j[k], g_on[k] if led_on[k] else g_off[k])
+        for k in range(M):
+            row = N + k
+            # summed like the COO duplicates in build_matrix, so a shorted
+            # source is singular on both paths
+            if vs_i[k] >= 0:
+                A[row, vs_i[k]] += 1.0
+                A[vs_i[k], row] += 1.0
+            if vs_j[k] >= 0:
+                A[row, vs_j[k]] -= 1.0
+                A[vs_j[k], row] -= 1.0
+            z[row] = vs_v[k]
+        x = np.linalg.solve(A, z)
+        changed = False
+        for k in range(len(led_on)):
+            va = x[led_i[k]] if led_i[k] >= 0 else 0.0
+            vb = x[led_j[k]] if led_j[k] >= 0 else 0.0
+            on = va - vb >= thresh[k]
+            if on != led_on[k]:
+                led_on[k] = on
+                changed = True
+        if not changed:
+            break
+    return x, led_on
+
+if njit is not None:
+    _stamp = njit(cache=True)(_stamp)
+    _solve_ledloop = njit(cache=True)(_solve_ledloop)
+
 class Solver:
     def __init__(self, circuit, ground=(0,0)):
         self.circuit = circuit
         self.ground = ground
         self.node_map, self.num_nodes = compute_lumps(circuit.nodes(), circuit.components)
         self.ground_idx = self.node_map[ground]
+        self._build_topology()
+        # (LED states, LED conductances, factorization) of the last matrix factorized
+        self._lu = None
+
+    def _build_topology(self):
+        """Precompute the index arrays used to stamp the MNA matrix."""
+        # row of each lump in the reduced system, -1 for ground
+        lumps = np.arange(self.num_nodes)
+        reduced = lumps - (lumps > self.ground_idx)
+        reduced[self.ground_idx] = -1
+        self._node_index = {n: int(reduced[n]) for n in range(self.num_nodes) if n != self.ground_idx}
+
+        def ends(comps):
+            i = np.array([reduced[self.node_map[c.a]] for c in comps], dtype=int)
+            j = np.array([reduced[self.node_map[c.b]] for c in comps], dtype=int)
+            return i, j
+
+        comps = self.circuit.components
+        self._resistors = [c for c in comps if isinstance(c, Resistor)]
+        self._leds = [c for c in comps if isinstance(c, LED)]
+        self._voltage_sources = [c for c in comps if isinstance(c, VoltageSource)]
+        # resistors first, then LEDs, sharing one set of endpoint arrays
+        self._res_i, self._res_j = ends(self._resistors + self._leds)
+        self._g_res = np.array([1.0 / c.resistance for c in self._resistors], dtype=float)
+        self._r_on = np.array([led.r_on for led in self._leds], dtype=float)
+        self._vs_i, self._vs_j = ends(self._voltage_sources)
+
+    def refresh(self):
+        """Reload component values edited in place since the solver was built."""
+        g_res = np.array([1.0 / c.resistance for c in self._resistors], dtype=float)
+        r_on = np.array([led.r_on for led in self._leds], dtype=float)
+        if not (np.array_equal(g_res, self._g_res) and np.array_equal(r_on, self._r_on)):
+            self._g_res, self._r_on = g_res, r_on
+            self._lu = None
+
+    def _size(self):
+        return self.num_nodes - 1 + len(self._voltage_sources)
+
+    def _rhs(self):
+        z = np.zeros(self._size())
+        z[self.num_nodes - 1:] = [vs.voltage for vs in self._voltage_sources]
+        return z
 
     def build_matrix(self):
+        """Return the sparse (CSC) MNA matrix, right hand side and node index."""
         N = self.num_nodes - 1  # excluding ground
-        voltage_sources = [c for c in self.circuit.components if isinstance(c, VoltageSource)]
-        M = len(voltage_sources)
+        M = len(self._voltage_sources)
         size = N + M
-        A = np.zeros((size, size))
-        z = np.zeros(size)
-        node_index = {}
-        idx = 0
-        for n in range(self.num_nodes):
-            if n == self.ground_idx:
-                continue
-            node_index[n] = idx
-            idx += 1
-
-        def add_conductance(i, j, g):
-            if i != self.ground_idx:
-                ii = node_index[i]
-                A[ii, ii] += g
-            if j != self.ground_idx:
-                jj = node_index[j]
-                A[jj, jj] += g
-            if i != self.ground_idx and j != self.ground_idx:
-                ii, jj = node_index[i], node_index[j]
-                A[ii, jj] -= g
-                A[jj, ii] -= g
 
-        for comp in self.circuit.components:
-            a = self.node_map[comp.a]
-            b = self.node_map[comp.b]
-            if isinstance(comp, Resistor):
-                g = 1.0 / comp.resistance
-                add_conductance(a, b, g)
-            elif isinstance(comp, LED):
-                g = 1.0 / comp.effective_resistance()
-                add_conductance(a, b, g)
+        g_led = [1.0 / led.effective_resistance() for led in self._leds]
+        g = np.concatenate([self._g_res, g_led])
+        i, j = self._res_i, self._res_j
+        mi, mj = i >= 0, j >= 0
+        mij = mi & mj
         # voltage sources
-        for k, vs in enumerate(voltage_sources):
-            a = self.node_map[vs.a]
-            b = self.node_map[vs.b]
-            row = N + k
-            if a != self.ground_idx:
-                A[row, node_index[a]] = 1
-                A[node_index[a], row] = 1
-            if b != self.ground_idx:
-                A[row, node_index[b]] = -1
-                A[node_index[b], row] = -1
-            z[row] = vs.voltage
-        return A, z, node_index
-
-    def solve(self, max_iter=10):
-        leds = [c for c in self.circuit.components if isinstance(c, LED)]
+        vs_rows = N + np.arange(M)
+        a, b = self._vs_i, self._vs_j
+        ma, mb = a >= 0, b >= 0
+        ones_a, ones_b = np.ones(ma.sum()), np.ones(mb.sum())
+        # duplicate entries are summed when converting from COO
+        rows = [i[mi], j[mj], i[mij], j[mij], vs_rows[ma], a[ma], vs_rows[mb], b[mb]]
+        cols = [i[mi], j[mj], j[mij], i[mij], a[ma], vs_rows[ma], b[mb], vs_rows[mb]]
+        vals = [g[mi], g[mj], -g[mij], -g[mij], ones_a, ones_a, -ones_b, -ones_b]
+        A = sparse.coo_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(size, size),
+        ).tocsc()
+        return A, self._rhs(), self._node_index
+
+    def _led_conductances(self):
+        return np.array([1.0 / led.effective_resistance() for led in self._leds], dtype=float)
+
+    def _solve_system(self, z, max_rank=8):
+        """Solve the MNA system for the current LED states.
+
+        The last factorization is reused. If up to max_rank LEDs changed state
+        since it was built, their conductance changes are applied as a low rank
+        (Woodbury) correction instead of refactorizing the matrix.
+        """
+        states = np.array([led.on for led in self._leds], dtype=bool)
+        if self._lu is not None:
+            base_states, base_g, lu = self._lu
+            flipped = np.flatnonzero(states != base_states)
+            if len(flipped) == 0:
+                return lu.solve(z)
+            if len(flipped) <= max_rank:
+                delta = self._led_conductances()[flipped] - base_g[flipped]
+                return self._woodbury(lu, flipped, delta, z)
+        A, _, _ = self.build_matrix()
+        self._lu = (states, self._led_conductances(), splu(A))
+        return self._lu[2].solve(z)
+
+    def _woodbury(self, lu, flipped, delta, z):
+        """Solve (A + E diag(delta) E^T) x = z given the factorization of A.
+
+        Column k of E is the incidence vector of the k-th flipped LED.
+        """
+        offset = len(self._resistors)
+        E = np.zeros((len(z), len(flipped)))
+        for k, led in enumerate(flipped):
+            i, j = self._res_i[offset + led], self._res_j[offset + led]
+            if i >= 0:
+                E[i, k] += 1.0
+            if j >= 0:
+                E[j, k] -= 1.0
+        y = lu.solve(z)
+        W = lu.solve(E)
+        C = np.diag(1.0 / delta) + E.T @ W
+        return y - W @ np.linalg.solve(C, E.T @ y)
+
+    def _solve_sparse(self, max_iter):
+        z = self._rhs()
+        x = z
         last_states = None
-        voltages = None
         for _ in range(max_iter):
-            A, z, node_index = self.build_matrix()
-            x = np.linalg.solve(A, z)
-            V = {self.ground_idx: 0.0}
-            for n, idx in node_index.items():
-                V[n] = x[idx]
+            x = self._solve_system(z) if len(z) else z
             # update LED states
+            v = np.append(x[:self.num_nodes - 1], 0.0)  # index -1 is ground
+            off = len(self._resistors)
+            drop = v[self._res_i[off:]] - v[self._res_j[off:]]
             states = []
-            for led in leds:
-                va = V[self.node_map[led.a]]
-                vb = V[self.node_map[led.b]]
-                led.on = (va - vb) >= led.threshold
+            for led, dv in zip(self._leds, drop):
+                led.on = bool(dv >= led.threshold)
                 states.append(led.on)
-            voltages = V
             if states == last_states:
                 break
             last_states = states
+        return x
+
+    def _solve_jit(self, max_iter):
+        off = len(self._resistors)
+        x, led_on = _solve_ledloop(
+            self._res_i[:off], self._res_j[:off], self._g_res,
+            self._res_i[off:], self._res_j[off:],
+            1.0 / self._r_on,
+            np.array([1.0 / led.r_off for led in self._leds], dtype=float),
+            np.array([led.threshold for led in self._leds], dtype=float),
+            np.array([led.on for led in self._leds], dtype=np.bool_),
+            self._vs_i, self._vs_j, self._rhs()[self.num_nodes - 1:],
+            self.num_nodes - 1, len(self._voltage_sources), max_iter,
+        )
+        for led, on in zip(self._leds, led_on):
+            led.on = bool(on)
+        return x
+
+    def solve(self, max_iter=10):
+        if njit is not None and 0 < self._size() <= JIT_MAX_SIZE:
+            x = self._solve_jit(max_iter)
+        else:
+            x = self._solve_sparse(max_iter)
+        voltages = {self.ground_idx: 0.0}
+        for n, idx in self._node_index.items():
+            voltages[n] = x[idx]
         self.voltages = voltages
+        self._x = x
         self.currents = {}
+        N = self.num_nodes - 1
+        vs_index = {id(vs): k for k, vs in enumerate(self._voltage_sources)}
         for comp in self.circuit.components:
             va = self.voltages[self.node_map[comp.a]]
             vb = self.voltages[self.node_map[comp.b]]
@@ -195,9 +403,7 @@ class Solver:
                 self.currents[comp.name] = (va - vb) / R if R < 1e8 else 0.0
             elif isinstance(comp, VoltageSource):
                 # current is extracted from solution vector
-                idx = [c for c in self.circuit.components if isinstance(c, VoltageSource)].index(comp)
-                N = self.num_nodes - 1
-                self.currents[comp.name] = x[N + idx]
+                self.currents[comp.name] = self._x[N + vs_index[id(comp)]]
         return self.voltages, self.currents
 
     def print_summary(self):
@@ -235,6 +441,15 @@ class Solver:
         ax.grid(True)
         plt.show()
 
+def _component_color(comp):
+    if isinstance(comp, VoltageSource):
+        return 'blue'
+    elif isinstance(comp, Resistor):
+        return 'orange'
+    elif isinstance(comp, LED):
+        return 'red' if comp.on else 'gray'
+    return 'black'
+
 def draw_grid(grid, voltages, solver, ax=None):
     """Visualize a GridCircuit with node voltages.
 
@@ -252,15 +467,7 @@ def draw_grid(grid, voltages, solver, ax=None):
     for comp in grid.components:
         x = [comp.a[0], comp.b[0]]
         y = [comp.a[1], comp.b[1]]
-        if isinstance(comp, VoltageSource):
-            color = 'blue'
-        elif isinstance(comp, Resistor):
-            color = 'orange'
-        elif isinstance(comp, LED):
-            color = 'red' if comp.on else 'gray'
-        else:
-            color = 'black'
-        ax.plot(x, y, color=color, linewidth=3)
+        ax.plot(x, y, color=_component_color(comp), linewidth=3)
         xm = (x[0] + x[1]) / 2
         ym = (y[0] + y[1]) / 2
         ax.text(xm, ym, comp.name, fontsize=8, ha='center')
@@ -273,6 +480,45 @@ def draw_grid(grid, voltages, solver, ax=None):
     if show:
         plt.show()
 
+def draw_grid_incremental(grid, voltages, solver, ax, artists, volt_texts):
+    """Update an existing draw of a GridCircuit in place.
+
+    *artists* maps each component to its ``(line, label)`` artists and
+    *volt_texts* maps each node position to its ``(label, marker)`` artists.
+    Both are updated so that only added or removed components and nodes
+    create or delete artists; everything else just has its color or text set.
+    """
+    present = set()
+    for comp in grid.components:
+        present.add(comp)
+        color = _component_color(comp)
+        if comp in artists:
+            line, text = artists[comp]
+            line.set_color(color)
+            text.set_text(comp.name)
+            continue
+        x = [comp.a[0], comp.b[0]]
+        y = [comp.a[1], comp.b[1]]
+        line, = ax.plot(x, y, color=color, linewidth=3)
+        text = ax.text((x[0] + x[1]) / 2, (y[0] + y[1]) / 2, comp.name, fontsize=8, ha='center')
+        artists[comp] = (line, text)
+    for comp in [c for c in artists if c not in present]:
+        for artist in artists.pop(comp):
+            artist.remove()
+
+    positions = solver.node_map if solver is not None else {}
+    for pos in positions:
+        label = f"{voltages.get(pos, 0.0):.2f}V"
+        if pos in volt_texts:
+            volt_texts[pos][0].set_text(label)
+            continue
+        text = ax.text(pos[0], pos[1], label, color='purple', ha='center', va='bottom', fontsize=8)
+        marker, = ax.plot(pos[0], pos[1], 'ko')
+        volt_texts[pos] = (text, marker)
+    for pos in [p for p in volt_texts if p not in positions]:
+        for artist in volt_texts.pop(pos):
+            artist.remove()
+
 # Example circuits
 
 def circuit_led():